@@ -11,23 +11,111 @@ The API uses FastAPI framework and integrates with:
 - Vector store for document storage and retrieval
 - RAG agent for intelligent question answering
 - PGVector for vector database operations
+
+Heavy subsystems (models, LangChain, DB clients) are imported and built on
+first use so workers start fast. Query-side subsystems are warmed in the
+background at startup when WARMUP_ON_STARTUP is set; ingest-only
+dependencies load on the first /upload. GET /ready reports warm-up state.
 """
 
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from vector_store.embedding import get_embedding_model         
-from vector_store.chunking import chunks_app  
-from vector_store.vector_store import insert_chunks_to_pg, clear_pgvector_table
-from rag_agent.rag_pipeline import qa_chain   
-from rag_agent.rag_agent import RAGAgent
-from config import AVGO_TABLE_NAME
+from config import AVGO_TABLE_NAME, PDF_EXTRACTION_MODE, WARMUP_ON_STARTUP
 from logger import setup_logger
 
 # Setup logger
 logger = setup_logger("app", "app.log")
 
-app = FastAPI(title="RAG + PGVector API")
-agent = RAGAgent(vb_table_name=AVGO_TABLE_NAME, history_limit=10)
+
+class LazySubsystem:
+    """
+    Builds a heavy subsystem on first use and tracks its warm-up state.
+    """
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.state = "cold"
+        self.error = None
+        self._factory = factory
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self.state == "ready":
+            return self._value
+        with self._lock:
+            if self.state != "ready":
+                self.state = "warming"
+                logger.info("Warming up subsystem: %s", self.name)
+                try:
+                    self._value = self._factory()
+                except Exception as e:
+                    self.state = "failed"
+                    self.error = str(e)
+                    logger.error("Failed to warm up subsystem %s: %s", self.name, e)
+                    raise
+                self.error = None
+                self.state = "ready"
+                logger.info("Subsystem ready: %s", self.name)
+        return self._value
+
+    def status(self):
+        return {"state": self.state, "error": self.error}
+
+
+def _load_rag():
+    from rag_agent.rag_pipeline import qa_chain
+    from rag_agent.retriever import get_embedding_model
+    from rag_agent.llm import get_llm
+
+    # Embed once so lazy backends (e.g. the ONNX session) actually load
+    get_embedding_model().embed_query("warmup")
+    get_llm()
+    return qa_chain
+
+
+def _load_agent():
+    from rag_agent.rag_agent import RAGAgent
+    return RAGAgent(vb_table_name=AVGO_TABLE_NAME, history_limit=10)
+
+
+def _load_ingest():
+    from vector_store.chunking import chunks_app, chunk_cache_key
+    from vector_store.embedding import embed_chunks
+    return chunks_app, chunk_cache_key, embed_chunks
+
+
+rag = LazySubsystem("rag", _load_rag)
+agent = LazySubsystem("agent", _load_agent)
+ingest = LazySubsystem("ingest", _load_ingest)
+
+# Subsystems that must be warm before the worker reports ready
+SERVING_SUBSYSTEMS = (rag, agent)
+
+
+def _warm_up():
+    for subsystem in SERVING_SUBSYSTEMS:
+        try:
+            subsystem.get()
+        except Exception:
+            # Already logged; the next request retries the build
+            pass
+
+
+@asynccontextmanager
+async def lifespan(app):
+    if WARMUP_ON_STARTUP:
+        threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
+    yield
+
+
+app = FastAPI(title="RAG + PGVector API", lifespan=lifespan)
+
+# Vendor config used to chunk uploaded PDFs
+UPLOAD_VENDOR = "broadcom_sonic"
 
 # Request Schemas
 class QueryRequest(BaseModel):
@@ -52,19 +140,34 @@ class ChatResponse(BaseModel):
 
 # API Endpoints
 
+@app.get("/ready")
+def ready_api():
+    """
+    Report warm-up state of the heavy subsystems; 503 until serving is warm.
+
+    With WARMUP_ON_STARTUP disabled nothing is built until the first request,
+    so the worker reports ready immediately and that request pays the cost.
+    """
+    subsystems = {s.name: s.status() for s in (rag, agent, ingest)}
+    is_ready = not WARMUP_ON_STARTUP or all(s.state == "ready" for s in SERVING_SUBSYSTEMS)
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"ready": is_ready, "subsystems": subsystems},
+    )
+
 @app.post("/query")
 def query_api(req: QueryRequest):
     """
     Query the RAG chain using a specified table and question.
     """
     try:
-        logger.info(f"Processing query request: {req.question} for table: {req.vb_table}")
-        chain = qa_chain(req.vb_table)
+        logger.info("Processing query request: %s for table: %s", req.question, req.vb_table)
+        chain = rag.get()(req.vb_table)
         answer = chain.run(req.question)
-        logger.info(f"Successfully generated answer for query: {req.question}")
+        logger.info("Successfully generated answer for query: %s", req.question)
         return {"question": req.question, "answer": answer}
     except Exception as e:
-        logger.error(f"Error processing query: {str(e)}")
+        logger.error("Error processing query: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/upload")
@@ -73,14 +176,20 @@ def upload_api(req: UploadRequest):
     Upload a PDF, chunk it, embed it, and insert into the specified vector table.
     """
     try:
-        logger.info(f"Processing upload request for PDF: {req.pdf_path} to table: {req.vb_table}")
-        chunks = chunks_app(req.pdf_path)
-        embed_fn = get_embedding_model()
-        insert_chunks_to_pg(chunks, embed_fn, req.vb_table)
-        logger.info(f"Successfully uploaded {len(chunks)} chunks to table: {req.vb_table}")
+        logger.info("Processing upload request for PDF: %s to table: %s", req.pdf_path, req.vb_table)
+        from vector_store.vector_store import insert_chunks_to_pg
+
+        chunks_app, chunk_cache_key, embed_chunks = ingest.get()
+        # One key for both chunk and embedding caches
+        vendor, mode = UPLOAD_VENDOR, PDF_EXTRACTION_MODE
+        cache_key = chunk_cache_key(req.pdf_path, vendor, mode)
+        chunks = chunks_app(req.pdf_path, vendor, mode, cache_key=cache_key)
+        embeddings = embed_chunks(chunks, cache_key)
+        insert_chunks_to_pg(chunks, None, req.vb_table, embeddings=embeddings)
+        logger.info("Successfully uploaded %s chunks to table: %s", len(chunks), req.vb_table)
         return {"status": "✅ uploaded", "count": len(chunks)}
     except Exception as e:
-        logger.error(f"Error processing upload: {str(e)}")
+        logger.error("Error processing upload: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/clear")
@@ -89,21 +198,23 @@ def clear_api(req: ClearRequest):
     Clear all embeddings from a vector table by name.
     """
     try:
-        logger.info(f"Processing clear request for table: {req.vb_table}")
+        from vector_store.vector_store import clear_pgvector_table
+
+        logger.info("Processing clear request for table: %s", req.vb_table)
         clear_pgvector_table(req.vb_table)
-        logger.info(f"Successfully cleared table: {req.vb_table}")
+        logger.info("Successfully cleared table: %s", req.vb_table)
         return {"status": f"✅ cleared {req.vb_table}"}
     except Exception as e:
-        logger.error(f"Error clearing table: {str(e)}")
+        logger.error("Error clearing table: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/chat", response_model=ChatResponse)
 def chat(request: ChatRequest):
     try:
-        logger.info(f"Processing chat request: {request.query} with session: {request.session_id}")
-        result = agent.run(request.query, session_id=request.session_id)
-        logger.info(f"Successfully generated chat response for session: {request.session_id}")
+        logger.info("Processing chat request: %s with session: %s", request.query, request.session_id)
+        result = agent.get().run(request.query, session_id=request.session_id)
+        logger.info("Successfully generated chat response for session: %s", request.session_id)
         return ChatResponse(session_id=request.session_id or "new-session", result=result)
     except Exception as e:
-        logger.error(f"Error processing chat: {str(e)}")
+        logger.error("Error processing chat: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -37,6 +37,16 @@ VENDOR_CONFIGS = {
             r"^EOS\s+\d+\.\d+\.\d+",
             r"^\d{1,4}$",
             r"^Arista EOS Configuration Manual.*"
+        ],
+        # Heading patterns override the chunker defaults (numbered sections,
+        # "Chapter N:" titles) for manuals that lay headings out differently
+        # Chapter headings are "Chapter N", "Chapter N: Title" or
+        # "Chapter N Title"; prose like "Chapter 3 describes ..." is body
+        "chapter_patterns": [
+            r"^(?=.{1,100}$)(?!.*[.,;]$)Chapter\s+\d+(:.*|\s+[A-Z][^.]*)?$"
+        ],
+        "section_patterns": [
+            r"^\d+(\.\d+)+\s+[A-Z].*"
         ]
     },
     "cisco_nxos": {
@@ -47,6 +57,19 @@ VENDOR_CONFIGS = {
             r"^NX-OS Version.*",
             r"^\d{1,4}$",
             r"^Cisco NX-OS Configuration Guide.*"
+        ],
+        "chapter_patterns": [
+            r"^CHAPTER\s+\d+$"
+        ],
+        # Headings are short, unpunctuated and Title Case after the keyword,
+        # so prose such as "Configuring a VLAN requires ..." stays body text
+        "section_patterns": [
+            r"^(?=.{1,80}$)(?!.*[.:;,]$)"
+            r"(Information About|Licensing Requirements for|Prerequisites for|"
+            r"Guidelines and Limitations for|Default Settings for|Configuring|"
+            r"Verifying the|Configuration Examples for|Feature History for)"
+            r"(\s+([A-Z0-9][\w/().+-]*|[a-z]+[A-Z][\w/().+-]*|"
+            r"a|an|and|the|of|for|on|in|to|with|by))+$"
         ]
     }
     # ... Add more vendors here
@@ -59,13 +82,38 @@ def get_vendor_config(vendor_name: str):
     return VENDOR_CONFIGS[vendor_name]
 
 
+# PDF extraction mode: "text" splits plain page text on heading regexes,
+# "layout" uses the PDF outline, font sizes and block positions
+PDF_EXTRACTION_MODE = "text"
+# Worker processes for layout extraction; None/1 extracts in-process.
+# Only worth raising for very large, text-dense manuals (spawn start-up
+# costs more than extracting a few hundred simple pages)
+PDF_EXTRACTION_WORKERS = None
+
+
+# Parsed-document / embedding cache location
+CACHE_DIR = "cache"
+
+
 # Embedding Config
 EMBEDDING_MODEL_NAME = "BAAI/bge-small-en"
 EMBED_DIM = 384
+# "torch" runs SentenceTransformer / HuggingFaceEmbeddings,
+# "onnx" serves the exported model from ONNX_MODEL_DIR with onnxruntime
+EMBEDDING_BACKEND = "torch"
+ONNX_MODEL_DIR = "models/bge-small-en-onnx"
+ONNX_QUANTIZE = True
+# Minimum cosine similarity between ONNX and PyTorch embeddings on export
+ONNX_PARITY_THRESHOLD = 0.99
 
 
 # VB Table Name
 AVGO_TABLE_NAME = "broadcom_sonic"
 
+# Build query-side models / clients in the background at app startup and
+# gate /ready on it; when False they are built on the first request and
+# /ready reports ready immediately
+WARMUP_ON_STARTUP = True
+
 # LLM 
 LLM_NAME = "deepseek/deepseek-chat-v3-0324:free"
\ No newline at end of file
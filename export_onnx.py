@@ -0,0 +1,19 @@
+"""
+Export the embedding model to ONNX (see ``vector_store/onnx_backend.py``).
+
+The vector_store modules use package-relative imports (``..config``), so
+this script imports them through the project directory as a package
+instead of relying on ``python -m`` from the project root::
+
+    python export_onnx.py [--no-quantize] [--model NAME] [--out-dir DIR]
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+if __name__ == "__main__":
+    project_dir = Path(__file__).resolve().parent
+    sys.path.insert(0, str(project_dir.parent))
+    onnx_backend = importlib.import_module(f"{project_dir.name}.vector_store.onnx_backend")
+    onnx_backend.main()
@@ -1,44 +1,214 @@
 """
 Logging configuration for the SONiCTrace project.
+
+Records are handed to a background ``QueueListener`` thread, so callers only
+pay for enqueueing a record; formatting and the actual stdout/file writes
+happen off the request thread. Log files are rotated by size.
 """
 
+import atexit
+import itertools
 import logging
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 # Create logs directory if it doesn't exist
 log_dir = Path("logs")
 log_dir.mkdir(exist_ok=True)
 
+# Rotation settings for per-module log files
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
 # Configure logging format
 log_format = logging.Formatter(
     '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+_log_queue = queue.SimpleQueue()
+_listener = None
+_shut_down = False
+_lock = threading.Lock()
+
+# Argument types that cannot change between the log call and formatting
+_IMMUTABLE_ARGS = (str, bytes, int, float, bool, type(None))
+
+
+class _FileRouter(logging.Handler):
+    """
+    Writes each record to the rotating file of the logger that queued it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.files = {}
+
+    def add_file(self, log_file: str):
+        if log_file not in self.files:
+            handler = RotatingFileHandler(
+                log_dir / log_file,
+                maxBytes=LOG_MAX_BYTES,
+                backupCount=LOG_BACKUP_COUNT,
+                encoding="utf-8",
+            )
+            handler.setFormatter(log_format)
+            self.files[log_file] = handler
+
+    def emit(self, record):
+        handler = self.files.get(getattr(record, "log_file", None))
+        if handler is not None:
+            handler.handle(record)
+
+    def close(self):
+        for handler in self.files.values():
+            handler.close()
+        super().close()
+
+
+class _SonicQueueHandler(QueueHandler):
+    """
+    Enqueues records without formatting them on the calling thread.
+    """
+
+    def __init__(self, log_file: str = None):
+        super().__init__(_log_queue)
+        self.log_file = log_file
+
+    def prepare(self, record):
+        # The stdlib implementation formats the message here; defer that to
+        # the listener thread when the args are immutable, otherwise snapshot
+        # the message now so later mutation of the args cannot leak in.
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(a, _IMMUTABLE_ARGS) for a in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        record.log_file = self.log_file
+        return record
+
+
+class _DirectHandler(logging.Handler):
+    """
+    Writes synchronously to stdout and the logger's file; replaces the queue
+    handlers once the background writer has been stopped.
+    """
+
+    def __init__(self, log_file: str = None):
+        super().__init__()
+        self.log_file = log_file
+
+    def emit(self, record):
+        record.log_file = self.log_file
+        _console_handler.handle(record)
+        _file_router.handle(record)
+
+
+class _EveryNth(logging.Filter):
+    """
+    Lets through the first record and then one out of every ``n``.
+    """
+
+    def __init__(self, n: int):
+        super().__init__()
+        self.n = max(1, n)
+        self._counter = itertools.count()
+
+    def filter(self, record):
+        return next(self._counter) % self.n == 0
+
+
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(log_format)
+_file_router = _FileRouter()
+
+
+def _ensure_listener():
+    global _listener
+    if _listener is None:
+        _listener = QueueListener(_log_queue, _console_handler, _file_router)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def _sonic_handler(logger):
+    for handler in logger.handlers:
+        if isinstance(handler, (_SonicQueueHandler, _DirectHandler)):
+            return handler
+    return None
+
+
+def shutdown_logging():
+    """
+    Flush pending records and stop the background writer.
+
+    Loggers set up through :func:`setup_logger` switch to synchronous
+    writes afterwards, so records logged during interpreter exit still
+    reach stdout and their log file.
+    """
+    global _listener, _shut_down
+    with _lock:
+        _shut_down = True
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for logger in list(logging.Logger.manager.loggerDict.values()):
+            if not isinstance(logger, logging.Logger):
+                continue
+            handler = _sonic_handler(logger)
+            if isinstance(handler, _SonicQueueHandler):
+                logger.removeHandler(handler)
+                logger.addHandler(_DirectHandler(handler.log_file))
+        for handler in _file_router.files.values():
+            handler.flush()
+
+
 def setup_logger(name: str, log_file: str = None, level=logging.INFO):
     """
     Set up a logger with the specified name and configuration.
-    
+
+    Calling this again for the same name returns the already configured
+    logger instead of attaching duplicate handlers.
+
+    Messages are formatted on the background thread when all ``%`` args are
+    str / bytes / numbers / None; any other args (lists, dicts, objects)
+    are formatted eagerly so the record reflects their state at call time.
+
     Args:
         name: Name of the logger
         log_file: Optional log file path
         level: Logging level
-    
+
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(log_format)
-    logger.addHandler(console_handler)
-    
-    # File handler (if log_file is specified)
-    if log_file:
-        file_handler = logging.FileHandler(log_dir / log_file)
-        file_handler.setFormatter(log_format)
-        logger.addHandler(file_handler)
-    
-    return logger 
\ No newline at end of file
+
+    with _lock:
+        if _sonic_handler(logger) is not None:
+            return logger
+
+        if log_file:
+            _file_router.add_file(log_file)
+        if _shut_down:
+            logger.addHandler(_DirectHandler(log_file))
+        else:
+            logger.addHandler(_SonicQueueHandler(log_file))
+            _ensure_listener()
+
+    return logger
+
+
+def sampled_logger(parent: logging.Logger, suffix: str, every: int):
+    """
+    Return a child of ``parent`` that only emits one record out of ``every``.
+
+    Intended for high-volume messages in hot loops; records still go through
+    the parent's handlers and log file.
+    """
+    logger = parent.getChild(suffix)
+    if not any(isinstance(f, _EveryNth) for f in logger.filters):
+        logger.addFilter(_EveryNth(every))
+    return logger
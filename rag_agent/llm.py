@@ -11,7 +11,7 @@ and user queries.
 """
 
 import os
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
 from dotenv import load_dotenv
 from ..config import LLM_NAME
 
@@ -19,9 +19,17 @@ from ..config import LLM_NAME
 
 load_dotenv()
 
-llm = ChatOpenAI(
-    model=LLM_NAME,
-    base_url="https://openrouter.ai/api/v1",
-    api_key=os.getenv("OPENROUTER_API_KEY"),
-    temperature=0
-)
+
+@lru_cache(maxsize=None)
+def get_llm():
+    """
+    Build the OpenRouter chat model on first use.
+    """
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=LLM_NAME,
+        base_url="https://openrouter.ai/api/v1",
+        api_key=os.getenv("OPENROUTER_API_KEY"),
+        temperature=0
+    )
@@ -17,11 +17,11 @@ from langchain_core.output_parsers import StrOutputParser
 #from langchain_core.runnables.cache import SQLiteCache
 from .retriever import retriever
 from .prompting import prompt
-from .llm import llm
-from supabase import create_client
+from .llm import get_llm
 import datetime
 import uuid
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from logger import setup_logger
 
@@ -34,7 +34,13 @@ logger = setup_logger("rag_agent", "rag_agent.log")
 # Supabase Setup
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+@lru_cache(maxsize=None)
+def get_supabase():
+    # Client is created on first use so importing this module stays cheap
+    from supabase import create_client
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # Enable LangChain
 #Runnable.set_default_cache(SQLiteCache("cache/sonic_agent_cache.sqlite"))
@@ -44,23 +50,23 @@ supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 # Memory Persistence
 def persist_memory(session_id: str, messages):
     try:
-        logger.info(f"Persisting memory for session: {session_id}")
+        logger.info("Persisting memory for session: %s", session_id)
         for m in messages:
-            supabase.table("chat_memory_log").insert({
+            get_supabase().table("chat_memory_log").insert({
                 "session_id": session_id,
                 "message_type": m["type"],
                 "message_content": m["content"],
                 "timestamp": datetime.datetime.utcnow().isoformat()
             }).execute()
-        logger.info(f"Successfully persisted {len(messages)} messages for session: {session_id}")
+        logger.info("Successfully persisted %s messages for session: %s", len(messages), session_id)
     except Exception as e:
-        logger.error(f"Error persisting memory: {str(e)}")
+        logger.error("Error persisting memory: %s", e)
         raise
 
 # RAGAgent Class
 class RAGAgent:
     def __init__(self, vb_table_name: str, history_limit: int = 10):
-        logger.info(f"Initializing RAGAgent with table: {vb_table_name}, history_limit: {history_limit}")
+        logger.info("Initializing RAGAgent with table: %s, history_limit: %s", vb_table_name, history_limit)
         self.retriever = retriever(vb_table_name)
         self.parser = StrOutputParser()
         self.history_limit = history_limit
@@ -73,28 +79,28 @@ class RAGAgent:
             })
             | RunnableLambda(self._merge_docs)
             | prompt
-            | llm
+            | get_llm()
             | self.parser
         )
         logger.info("RAGAgent initialized successfully")
 
     def _get_chat_history(self, session_id):
         try:
-            logger.info(f"Retrieving chat history for session: {session_id}")
-            res = supabase.table("chat_memory_log").select("*")\
+            logger.info("Retrieving chat history for session: %s", session_id)
+            res = get_supabase().table("chat_memory_log").select("*")\
                 .eq("session_id", session_id).order("timestamp", desc=False).execute()
 
             if not res.data:
-                logger.info(f"No chat history found for session: {session_id}")
+                logger.info("No chat history found for session: %s", session_id)
                 return None
 
             # limit last N histories（each=human+ai）
             limited = res.data[-2 * self.history_limit:]
             history_lines = [f"{m['message_type']}: {m['message_content']}" for m in limited]
-            logger.info(f"Retrieved {len(limited)} messages from chat history")
+            logger.info("Retrieved %s messages from chat history", len(limited))
             return "\n".join(history_lines)
         except Exception as e:
-            logger.error(f"Error retrieving chat history: {str(e)}")
+            logger.error("Error retrieving chat history: %s", e)
             raise
 
     def _merge_docs(self, x):
@@ -105,16 +111,16 @@ class RAGAgent:
                 "chat_history": x["chat_history"],
                 "context": "\n\n".join([doc.page_content for doc in x["context"]])
             }
-            logger.info(f"Merged {len(x['context'])} documents")
+            logger.info("Merged %s documents", len(x['context']))
             return merged
         except Exception as e:
-            logger.error(f"Error merging documents: {str(e)}")
+            logger.error("Error merging documents: %s", e)
             raise
 
     def run(self, query: str, session_id: str = None) -> dict:
         try:
             session_id = session_id or str(uuid.uuid4())
-            logger.info(f"Processing query: {query} for session: {session_id}")
+            logger.info("Processing query: %s for session: %s", query, session_id)
             
             persist_memory(session_id, [{"type": "human", "content": query}])
             chat_history = self._get_chat_history(session_id)
@@ -126,8 +132,8 @@ class RAGAgent:
             })
             
             persist_memory(session_id, [{"type": "ai", "content": str(result)}])
-            logger.info(f"Successfully generated response for session: {session_id}")
+            logger.info("Successfully generated response for session: %s", session_id)
             return result
         except Exception as e:
-            logger.error(f"Error in RAGAgent run: {str(e)}")
+            logger.error("Error in RAGAgent run: %s", e)
             raise
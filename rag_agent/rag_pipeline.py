@@ -11,16 +11,17 @@ The pipeline is designed to provide accurate and context-aware responses
 by retrieving relevant documents before generating answers.
 """
 
-from langchain.chains import RetrievalQA
-from .llm import llm
+from .llm import get_llm
 from .retriever import retriever
 from .prompting_template import prompt_template
 
 
 # build RAG QA chain with prompt
 def qa_chain(vb_table_name):
+    from langchain.chains import RetrievalQA
+
     return RetrievalQA.from_chain_type(
-        llm=llm,
+        llm=get_llm(),
         retriever=retriever(vb_table_name),
         chain_type="stuff",
         chain_type_kwargs={"prompt": prompt_template}
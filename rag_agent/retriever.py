@@ -3,7 +3,7 @@ Document Retriever implementation for the RAG system.
 
 This module provides the document retrieval functionality:
 - Uses PGVector for vector similarity search
-- Integrates with HuggingFace embeddings
+- Integrates with the configured embedding backend (PyTorch or ONNX)
 - Configures connection to the vector database
 - Provides methods for retrieving relevant documents
 
@@ -11,12 +11,11 @@ The retriever is responsible for finding the most relevant documents
 based on semantic similarity to the query.
 """
 
-from langchain_community.vectorstores.pgvector import PGVector
-from langchain_huggingface import HuggingFaceEmbeddings
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
-from ..config import EMBEDDING_MODEL_NAME
 from ..logger import setup_logger
+from ..vector_store.embedding import get_query_embeddings
 
 load_dotenv()
 
@@ -31,22 +30,24 @@ port = os.getenv("PG_PORT")
 
 CONNECTION_STRING = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{dbname}"
 
-embedding_model = HuggingFaceEmbeddings(
-    model_name=EMBEDDING_MODEL_NAME,
-    encode_kwargs={"normalize_embeddings": True}
-)
+@lru_cache(maxsize=None)
+def get_embedding_model():
+    # Query embeddings are loaded on first retriever use, not at import
+    return get_query_embeddings()
 
 def retriever(collection_name, k=3):
     try:
-        logger.info(f"Initializing retriever for collection: {collection_name}")
+        from langchain_community.vectorstores.pgvector import PGVector
+
+        logger.info("Initializing retriever for collection: %s", collection_name)
         vectorstore = PGVector(
             collection_name=collection_name,
             connection_string=CONNECTION_STRING,
-            embedding_function=embedding_model,
+            embedding_function=get_embedding_model(),
         )
-        logger.info(f"Successfully initialized retriever for collection: {collection_name}")
+        logger.info("Successfully initialized retriever for collection: %s", collection_name)
         return vectorstore.as_retriever(search_kwargs={"k": k})
     except Exception as e:
-        logger.error(f"Error initializing retriever: {str(e)}")
+        logger.error("Error initializing retriever: %s", e)
         raise
 
@@ -0,0 +1,120 @@
+"""
+On-disk cache for parsed documents and their embeddings.
+
+Entries are keyed by a digest of the PDF content plus everything that
+affects chunking (vendor config, extraction mode, tokenizer, token limit),
+so re-uploading the same manual to another table skips parsing entirely.
+
+Layout of one entry::
+
+    <CACHE_DIR>/chunks/<key>/chunks.jsonl              one chunk per line
+    <CACHE_DIR>/chunks/<key>/embeddings/<model>.npy    float32 (n, dim)
+
+Embedding files are plain ``.npy`` arrays and are loaded memory-mapped.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from ..config import CACHE_DIR
+from ..logger import setup_logger
+
+# Bump when the chunk format or chunking logic changes incompatibly
+CACHE_VERSION = 1
+
+logger = setup_logger("cache", "cache.log")
+
+
+@lru_cache(maxsize=64)
+def _digest(path, size, mtime_ns):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def file_digest(path):
+    """
+    SHA-256 of a file's content, memoized while size and mtime are unchanged.
+    """
+    st = os.stat(path)
+    return _digest(os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def make_cache_key(pdf_path, **params):
+    """
+    Build a cache key from the PDF content and JSON-serializable parameters.
+    """
+    payload = json.dumps(
+        {"version": CACHE_VERSION, "pdf": file_digest(pdf_path), **params},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _entry_dir(key):
+    return Path(CACHE_DIR) / "chunks" / key
+
+
+def _model_slug(model_name):
+    return re.sub(r"[^\w.-]+", "--", model_name)
+
+
+def _atomic_write(path, write):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_chunks(key):
+    path = _entry_dir(key) / "chunks.jsonl"
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        chunks = [json.loads(line) for line in f]
+    logger.info("Loaded %s cached chunks for key: %s", len(chunks), key)
+    return chunks
+
+
+def save_chunks(key, chunks):
+    def write(f):
+        for chunk in chunks:
+            f.write(json.dumps(chunk, ensure_ascii=False).encode("utf-8"))
+            f.write(b"\n")
+
+    _atomic_write(_entry_dir(key) / "chunks.jsonl", write)
+    logger.info("Cached %s chunks for key: %s", len(chunks), key)
+
+
+def load_embeddings(key, model_name):
+    """
+    Return a read-only memory-mapped ``(n, dim)`` array, or None on a miss.
+    """
+    path = _entry_dir(key) / "embeddings" / f"{_model_slug(model_name)}.npy"
+    if not path.exists():
+        return None
+    embeddings = np.load(path, mmap_mode="r")
+    logger.info("Loaded %s cached embeddings for key: %s, model: %s", len(embeddings), key, model_name)
+    return embeddings
+
+
+def save_embeddings(key, model_name, embeddings):
+    array = np.asarray(embeddings, dtype=np.float32)
+    path = _entry_dir(key) / "embeddings" / f"{_model_slug(model_name)}.npy"
+    _atomic_write(path, lambda f: np.save(f, array))
+    logger.info("Cached %s embeddings for key: %s, model: %s", len(array), key, model_name)
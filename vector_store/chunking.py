@@ -23,72 +23,155 @@ The chunking strategy is crucial for:
 import os
 import fitz
 import re
+from functools import lru_cache
 from pathlib import Path
-from transformers import AutoTokenizer
-from ..config import get_vendor_config, EMBEDDING_MODEL_NAME
-from ..logger import setup_logger
+from ..config import get_vendor_config, EMBEDDING_MODEL_NAME, PDF_EXTRACTION_MODE, PDF_EXTRACTION_WORKERS
+from ..logger import setup_logger, sampled_logger
+from . import pdf_layout
+from .pdf_layout import extract_layout, is_heading_block, normalize_title
+from .cache import make_cache_key, load_chunks, save_chunks
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
 # Setup logger
 logger = setup_logger("chunking", "chunking.log")
+# Per-section / per-segment messages fire thousands of times per manual
+section_logger = sampled_logger(logger, "sections", 50)
+segment_logger = sampled_logger(logger, "segments", 200)
 
 MAX_TOKENS = 512
 
-tokenizer = AutoTokenizer.from_pretrained(EMBEDDING_MODEL_NAME)
+@lru_cache(maxsize=None)
+def get_tokenizer():
+    # Loaded on first use so importing this module stays cheap
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(EMBEDDING_MODEL_NAME)
 
 def count_tokens_transformers(text):
-    return len(tokenizer.encode(text, add_special_tokens=False))
+    return len(get_tokenizer().encode(text, add_special_tokens=False))
 
 def split_text_semantically(text, max_tokens):
-    logger.info(f"Starting semantic text splitting, max tokens: {max_tokens}")
+    segment_logger.info("Starting semantic text splitting, max tokens: %d", max_tokens)
     try:
         if count_tokens_transformers(text) <= max_tokens:
-            logger.info("Text within token limit, returning as single chunk")
+            segment_logger.info("Text within token limit, returning as single chunk")
             return [text]
 
         lines = text.splitlines()
         segments = []
         buffer = ""
+        buffer_tokens = 0
 
         for line in lines:
             tentative = buffer + "\n" + line if buffer else line
-            if count_tokens_transformers(tentative) > max_tokens:
+            tentative_tokens = count_tokens_transformers(tentative)
+            if tentative_tokens > max_tokens:
                 if buffer:
                     segments.append(buffer.strip())
-                    logger.info(f"Created new segment with {count_tokens_transformers(buffer)} tokens")
+                    segment_logger.info("Created new segment with %d tokens", buffer_tokens)
                 buffer = line
+                buffer_tokens = count_tokens_transformers(line)
             else:
                 buffer = tentative
+                buffer_tokens = tentative_tokens
 
         if buffer:
             segments.append(buffer.strip())
-            logger.info(f"Created final segment with {count_tokens_transformers(buffer)} tokens")
+            segment_logger.info("Created final segment with %d tokens", buffer_tokens)
 
-        logger.info(f"Successfully split text into {len(segments)} segments")
+        segment_logger.info("Successfully split text into %d segments", len(segments))
         return segments
     except Exception as e:
-        logger.error(f"Error during semantic text splitting: {str(e)}")
+        logger.error("Error during semantic text splitting: %s", e)
         raise
 
+# Default heading patterns, used when a vendor config does not define its own
+DEFAULT_CHAPTER_PATTERNS = [r"(?i:^Chapter\s+\d+[:：])"]
+DEFAULT_SECTION_PATTERNS = [r"^\d+(\.\d+)+\s+.+"]
+
+LINE_SKIP = "skip"
+LINE_CHAPTER = "chapter"
+LINE_SECTION = "section"
+LINE_BODY = "body"
+
+
+class LineClassifier:
+    """
+    Classifies manual lines as skip / chapter / section / body in one pass.
+
+    All ignore and heading patterns are folded into a single alternation
+    regex, so each line is stripped once and matched once. Alternatives are
+    tried in order, so ignore patterns win over headings as before.
+    """
+
+    def __init__(self, ignore_patterns, chapter_patterns=None, section_patterns=None):
+        groups = [
+            (LINE_SKIP, ignore_patterns),
+            (LINE_CHAPTER, chapter_patterns or DEFAULT_CHAPTER_PATTERNS),
+            (LINE_SECTION, section_patterns or DEFAULT_SECTION_PATTERNS),
+        ]
+        alternation = "|".join(
+            f"(?P<{kind}>{'|'.join(f'(?:{pat})' for pat in patterns)})"
+            for kind, patterns in groups if patterns
+        )
+        self._match = re.compile(alternation).match
+
+    def classify(self, line):
+        """
+        Return ``(kind, stripped_line)`` for a raw line.
+        """
+        stripped = line.strip()
+        m = self._match(stripped)
+        return (m.lastgroup if m else LINE_BODY), stripped
+
+
+@lru_cache(maxsize=None)
+def _compile_classifier(ignore_patterns, chapter_patterns=None, section_patterns=None):
+    return LineClassifier(ignore_patterns, chapter_patterns, section_patterns)
+
+
+def get_line_classifier(vendor):
+    cfg = get_vendor_config(vendor)
+    return _compile_classifier(
+        tuple(cfg["ignore_patterns"]),
+        tuple(cfg.get("chapter_patterns") or ()) or None,
+        tuple(cfg.get("section_patterns") or ()) or None,
+    )
+
+
 # Patterns to filter out irrelevant lines like headers/footers
 def is_irrelevant(line, irrelevant_patterns):
-    return any(re.match(pat, line.strip()) for pat in irrelevant_patterns)
+    return _compile_classifier(tuple(irrelevant_patterns)).classify(line)[0] == LINE_SKIP
 
 def is_section_title(line):
-    return re.match(r"^\d+(\.\d+)+\s+.+", line.strip()) is not None
+    return _DEFAULT_CLASSIFIER.classify(line)[0] == LINE_SECTION
 
 def is_chapter_title(line):
-    return re.match(r"^Chapter\s+\d+[:：]", line.strip(), re.IGNORECASE)
+    return _DEFAULT_CLASSIFIER.classify(line)[0] == LINE_CHAPTER
+
+_DEFAULT_CLASSIFIER = LineClassifier([])
+
 
+def _append_section_chunks(chunks, title, text, page_range, source):
+    text = text.strip()
+    if not text:
+        return
+    for part in split_text_semantically(text, MAX_TOKENS):
+        chunks.append({
+            "section": title,
+            "content": part,
+            "page_range": list(page_range),
+            "source": source
+        })
 
 
-def parse_pdf_by_chapter_section_split(pdf_path, start_page, end_page, irrelevant_patterns):
-    logger.info(f"Starting PDF parsing: {pdf_path}, pages {start_page}-{end_page}")
+def parse_pdf_by_chapter_section_split(pdf_path, start_page, end_page, irrelevant_patterns, classifier=None):
+    logger.info("Starting PDF parsing: %s, pages %s-%s", pdf_path, start_page, end_page)
     doc = fitz.open(pdf_path)
-    logger.info(f"Successfully opened PDF with {len(doc)} pages")
+    logger.info("Successfully opened PDF with %s pages", len(doc))
     end_page = end_page or len(doc) - 1
     source = Path(pdf_path).name
+    classify = (classifier or _compile_classifier(tuple(irrelevant_patterns))).classify
 
     chunks = []
     current_title = "UNKNOWN"
@@ -98,52 +181,171 @@ def parse_pdf_by_chapter_section_split(pdf_path, start_page, end_page, irrelevan
     for i in range(start_page, end_page + 1):
         lines = doc[i].get_text().splitlines()
         for line in lines:
-            if is_irrelevant(line, irrelevant_patterns):
+            kind, stripped = classify(line)
+            if kind == LINE_SKIP:
                 continue
 
-            if is_chapter_title(line) or is_section_title(line):
-                if current_text.strip():
-                    for part in split_text_semantically(current_text.strip(), MAX_TOKENS):
-                        chunks.append({
-                            "section": current_title,
-                            "content": part,
-                            "page_range": [current_start_page, i],
-                            "source": source
-                        })
-                current_title = line.strip()
-                logger.info(f"Found new section: {current_title}")
+            if kind != LINE_BODY:
+                _append_section_chunks(chunks, current_title, current_text, [current_start_page, i], source)
+                current_title = stripped
+                section_logger.info("Found new section: %s", current_title)
                 current_text = ""
                 current_start_page = i
             else:
                 current_text += line + "\n"
 
 
-    if current_text.strip():
-        for part in split_text_semantically(current_text.strip(), MAX_TOKENS):
-            chunks.append({
-                "section": current_title,
-                "content": part,
-                "page_range": [current_start_page, end_page],
-                "source": source
-            })
+    _append_section_chunks(chunks, current_title, current_text, [current_start_page, end_page], source)
 
-    logger.info(f"Successfully created {len(chunks)} chunks from document")
+    logger.info("Successfully created %s chunks from document", len(chunks))
     return chunks
 
 
-def chunks_app(pdf_path, vendor = "broadcom_sonic"):
-    logger.info(f"Starting document chunking for: {pdf_path}, vendor: {vendor}")
+def _match_outline(lines, size, body_size, titles):
+    """
+    Return the outline title a block corresponds to, if any.
+
+    Blocks must match a title exactly after normalization (which ignores
+    leading section numbers). A heading-sized block also matches when it
+    contains the title or is a prefix of it (a heading wrapped across blocks).
+    """
+    text = normalize_title(" ".join(lines))
+    if not text:
+        return None
+    if text in titles:
+        return titles[text]
+    if is_heading_block(lines, size, body_size):
+        for norm, title in titles.items():
+            if norm in text or norm.startswith(text):
+                return title
+    return None
+
+
+def parse_pdf_by_layout(pdf_path, start_page, end_page, classifier, workers=None):
+    """
+    Chunk a PDF using block layout instead of plain text lines.
+
+    Section boundaries come from the PDF outline when it has one, otherwise
+    from blocks set in a larger font than the body text. Headers and footers
+    are dropped by page position during extraction; the vendor classifier
+    still removes stray skip lines (e.g. page numbers) from body text.
+    """
+    logger.info("Starting layout PDF parsing: %s, pages %s-%s", pdf_path, start_page, end_page)
+    pages, outline, body_size = extract_layout(pdf_path, start_page, end_page, workers)
+    logger.info("Extracted %s pages, %s outline pages, body font size %s", len(pages), len(outline), body_size)
+    end_page = pages[-1][0] if pages else start_page
+    source = Path(pdf_path).name
+
+    chunks = []
+    current_title = "UNKNOWN"
+    current_text = ""
+    current_start_page = start_page
+
+    for i, blocks in pages:
+        titles = {normalize_title(t): t for t in outline.get(i, [])}
+        block_titles = [_match_outline(lines, size, body_size, titles) for lines, size, _ in blocks]
+
+        # Pair outline entries without a matching block, in order, with the
+        # page's unclaimed heading-sized blocks
+        found = {normalize_title(t) for t in block_titles if t}
+        unmatched = [title for norm, title in titles.items() if norm not in found]
+        for j, (lines, size, _) in enumerate(blocks):
+            if not unmatched:
+                break
+            if block_titles[j] is None and is_heading_block(lines, size, body_size):
+                block_titles[j] = unmatched.pop(0)
+
+        # Entries with no candidate block at all open just before the page's
+        # first heading, so text above it stays with the previous section
+        open_at = next((j for j, t in enumerate(block_titles) if t), 0)
+        if not blocks:
+            blocks, block_titles = [([], 0.0, 0)], [None]
+
+        for j, ((lines, size, _), title) in enumerate(zip(blocks, block_titles)):
+            if j == open_at:
+                for orphan in unmatched:
+                    _append_section_chunks(chunks, current_title, current_text, [current_start_page, i], source)
+                    current_title, current_text, current_start_page = orphan, "", i
+
+            if title is None and not outline and is_heading_block(lines, size, body_size):
+                title = " ".join(line.strip() for line in lines)
+
+            if title is not None:
+                _append_section_chunks(chunks, current_title, current_text, [current_start_page, i], source)
+                current_title, current_text, current_start_page = title, "", i
+                section_logger.info("Found new section: %s", current_title)
+                continue
+
+            for line in lines:
+                kind, _ = classifier.classify(line)
+                if kind != LINE_SKIP:
+                    current_text += line + "\n"
+
+    _append_section_chunks(chunks, current_title, current_text, [current_start_page, end_page], source)
+
+    logger.info("Successfully created %s chunks from document", len(chunks))
+    return chunks
+
+
+def chunk_cache_key(pdf_path, vendor = "broadcom_sonic", mode = None):
+    """
+    Cache key for the chunks of a PDF under the current chunking settings.
+    """
+    mode = mode or PDF_EXTRACTION_MODE
+    params = dict(
+        vendor=vendor,
+        vendor_config=get_vendor_config(vendor),
+        mode=mode,
+        tokenizer=EMBEDDING_MODEL_NAME,
+        max_tokens=MAX_TOKENS,
+    )
+    if mode == "layout":
+        params["layout"] = {
+            "header_margin": pdf_layout.HEADER_MARGIN,
+            "footer_margin": pdf_layout.FOOTER_MARGIN,
+            "heading_size_ratio": pdf_layout.HEADING_SIZE_RATIO,
+            "max_heading_chars": pdf_layout.MAX_HEADING_CHARS,
+        }
+    return make_cache_key(pdf_path, **params)
+
+
+def chunks_app(pdf_path, vendor = "broadcom_sonic", mode = None, use_cache = True, cache_key = None):
+    """
+    Chunk a PDF, reusing cached chunks when available.
+
+    ``cache_key`` must come from :func:`chunk_cache_key` with the same
+    ``vendor`` and ``mode``; callers that also cache embeddings pass it in
+    so both caches share one entry.
+    """
+    mode = mode or PDF_EXTRACTION_MODE
+    logger.info("Starting document chunking for: %s, vendor: %s, mode: %s", pdf_path, vendor, mode)
     try:
         cfg = get_vendor_config(vendor)
-        logger.info(f"Retrieved vendor configuration for: {vendor}")
+        logger.info("Retrieved vendor configuration for: %s", vendor)
+
+        if use_cache:
+            key = cache_key or chunk_cache_key(pdf_path, vendor, mode)
+            chunks = load_chunks(key)
+            if chunks is not None:
+                logger.info("Using cached chunks for: %s", pdf_path)
+                return chunks
         
         start_page = cfg["start_page"]
         end_page = cfg["end_page"]
         irrelevant_patterns = cfg["ignore_patterns"]
+        classifier = get_line_classifier(vendor)
         
-        chunks = parse_pdf_by_chapter_section_split(pdf_path, start_page, end_page, irrelevant_patterns)
-        logger.info(f"Successfully completed chunking process")
+        if mode == "layout":
+            chunks = parse_pdf_by_layout(pdf_path, start_page, end_page, classifier, PDF_EXTRACTION_WORKERS)
+        elif mode == "text":
+            chunks = parse_pdf_by_chapter_section_split(pdf_path, start_page, end_page, irrelevant_patterns, classifier)
+        else:
+            raise ValueError(f"Unknown PDF extraction mode '{mode}'.")
+
+        if use_cache:
+            save_chunks(key, chunks)
+        logger.info("Successfully completed chunking process")
         return chunks
     except Exception as e:
-        logger.error(f"Error during document chunking: {str(e)}")
-        raise
\ No newline at end of file
+        logger.error("Error during document chunking: %s", e)
+        raise
@@ -5,19 +5,102 @@ This module provides functionality for:
 - Loading and configuring the embedding model
 - Generating embeddings for text chunks
 - Managing embedding model parameters
+- Reusing cached chunk embeddings keyed by model name
 
 The embedding model is used to convert text into vector representations
-for similarity search in the vector store.
+for similarity search in the vector store. The backend is selected by
+``EMBEDDING_BACKEND`` in ``config.py``: "torch" (SentenceTransformer) or
+"onnx" (onnxruntime, see ``onnx_backend``).
 """
 
-from sentence_transformers import SentenceTransformer
-from ..config import EMBEDDING_MODEL_NAME
+import hashlib
+from functools import lru_cache
+from langchain_core.embeddings import Embeddings
+from ..config import EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND, ONNX_MODEL_DIR
+from .cache import load_embeddings, save_embeddings
+
+PASSAGE_PREFIX = "Represent this sentence for searching relevant passages: "
+
+
+@lru_cache(maxsize=None)
+def get_encoder():
+    """
+    Return ``encode(texts) -> (n, dim) array`` of normalized embeddings for
+    the configured backend. The model is loaded once per process.
+    """
+    if EMBEDDING_BACKEND == "onnx":
+        from .onnx_backend import OnnxEmbedder
+
+        model = OnnxEmbedder(ONNX_MODEL_DIR)
+        return lambda texts: model.encode(texts, normalize_embeddings=True)
+
+    if EMBEDDING_BACKEND == "torch":
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+        return lambda texts: model.encode(texts, normalize_embeddings=True)
+
+    raise ValueError(f"Embedding backend '{EMBEDDING_BACKEND}' not supported.")
+
+
+def embedding_model_id():
+    """
+    Identifier of the model + backend, used to key cached embeddings.
+    """
+    if EMBEDDING_BACKEND == "onnx":
+        from .onnx_backend import exported_model_id
+
+        return exported_model_id(ONNX_MODEL_DIR)
+    return EMBEDDING_MODEL_NAME
 
 
 def get_embedding_model():
+    encode = get_encoder()
+    return lambda text: encode([PASSAGE_PREFIX + text])[0].tolist()
+
+
+class EncoderEmbeddings(Embeddings):
+    """
+    LangChain embeddings adapter over :func:`get_encoder`.
+    """
+
+    def embed_documents(self, texts):
+        return get_encoder()(list(texts)).tolist()
+
+    def embed_query(self, text):
+        return get_encoder()([text])[0].tolist()
+
+
+def get_query_embeddings():
+    """
+    LangChain embeddings for the retriever, matching the configured backend.
+    """
+    if EMBEDDING_BACKEND == "torch":
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        return HuggingFaceEmbeddings(
+            model_name=EMBEDDING_MODEL_NAME,
+            encode_kwargs={"normalize_embeddings": True}
+        )
+    return EncoderEmbeddings()
+
+
+def embed_chunks(chunks, cache_key=None):
+    """
+    Embed chunk contents, reusing cached embeddings for this model when
+    available. The model is only loaded on a cache miss.
+    """
+    # Passages are embedded with PASSAGE_PREFIX, so it is part of the key too
+    prefix_digest = hashlib.sha256(PASSAGE_PREFIX.encode("utf-8")).hexdigest()[:8]
+    model_id = f"{embedding_model_id()}+prefix-{prefix_digest}"
+    if cache_key:
+        cached = load_embeddings(cache_key, model_id)
+        if cached is not None and len(cached) == len(chunks):
+            return cached
+
+    encode = get_encoder()
+    embeddings = encode([PASSAGE_PREFIX + chunk["content"] for chunk in chunks])
 
-    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
-    return lambda text: model.encode(
-        "Represent this sentence for searching relevant passages: " + text,
-        normalize_embeddings=True
-    ).tolist()
+    if cache_key:
+        save_embeddings(cache_key, model_id, embeddings)
+    return embeddings
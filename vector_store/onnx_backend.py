@@ -0,0 +1,246 @@
+"""
+ONNX Runtime embedding backend for CPU-only inference.
+
+This module provides:
+- Export of a SentenceTransformer model to ONNX, with optional int8
+  dynamic quantization
+- A parity check of the exported model against the PyTorch output
+- ``OnnxEmbedder``, which serves embeddings with only ``onnxruntime`` and
+  ``tokenizers`` installed (no torch)
+
+Export once from the project root, then set ``EMBEDDING_BACKEND = "onnx"``
+in ``config.py``::
+
+    python export_onnx.py
+"""
+
+import argparse
+import inspect
+import json
+from pathlib import Path
+
+import numpy as np
+
+from ..config import (
+    EMBEDDING_MODEL_NAME,
+    ONNX_MODEL_DIR,
+    ONNX_QUANTIZE,
+    ONNX_PARITY_THRESHOLD,
+)
+from ..logger import setup_logger
+from .cache import file_digest
+
+logger = setup_logger("onnx_backend", "onnx_backend.log")
+
+METADATA_FILE = "embedding_meta.json"
+
+# SentenceTransformer pooling modes implemented by OnnxEmbedder
+SUPPORTED_POOLING = ("cls", "mean")
+
+PARITY_SAMPLES = [
+    "Configure BGP peering between two devices with AS numbers 65001 and 65002.",
+    "sonic(config)# interface Ethernet0 speed 100000",
+    "Enable ECN on the lossless queues of all front panel ports.",
+    "The show vlan brief command displays VLAN membership and tagging mode.",
+    "Represent this sentence for searching relevant passages: PFC watchdog",
+]
+
+
+class OnnxEmbedder:
+    """
+    Sentence embedder backed by an exported ONNX model.
+    """
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR, batch_size: int = 32):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        meta = json.loads((model_dir / METADATA_FILE).read_text())
+        self.model_name = meta["model_name"]
+        self.model_file = meta["model_file"]
+        self.pooling = meta["pooling"]
+        self.batch_size = batch_size
+        if self.pooling not in SUPPORTED_POOLING:
+            raise ValueError(f"Pooling mode '{self.pooling}' not supported.")
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=meta["max_length"])
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_dir / self.model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        logger.info("Loaded ONNX embedding model: %s (%s)", self.model_name, self.model_file)
+
+    def _encode_batch(self, texts):
+        encoded = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encoded], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encoded], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encoded], dtype=np.int64),
+        }
+        hidden = self.session.run(
+            ["last_hidden_state"], {name: feeds[name] for name in self.input_names}
+        )[0]
+
+        if self.pooling == "cls":
+            pooled = hidden[:, 0]
+        elif self.pooling == "mean":
+            mask = feeds["attention_mask"][..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled
+
+    def encode(self, texts, normalize_embeddings: bool = True):
+        """
+        Embed a list of texts into a float32 ``(n, dim)`` array.
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        # Sort by length so each batch pads to similar sequence lengths
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        out = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            idx = order[start:start + self.batch_size]
+            for i, vec in zip(idx, self._encode_batch([texts[i] for i in idx])):
+                out[i] = vec
+        embeddings = np.stack(out).astype(np.float32)
+        if normalize_embeddings:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings
+
+
+def exported_model_id(model_dir: str = ONNX_MODEL_DIR):
+    """
+    Identify the exported model actually served from ``model_dir``: source
+    model, served file and a digest of that file's content.
+    """
+    model_dir = Path(model_dir)
+    meta = json.loads((model_dir / METADATA_FILE).read_text())
+    digest = file_digest(model_dir / meta["model_file"])[:16]
+    return f"{meta['model_name']}@onnx:{meta['model_file']}:{digest}"
+
+
+def export_onnx(model_name: str = EMBEDDING_MODEL_NAME, out_dir: str = ONNX_MODEL_DIR,
+                quantize: bool = ONNX_QUANTIZE, max_length: int = None):
+    """
+    Export a SentenceTransformer model to ONNX. Requires torch.
+
+    ``max_length`` defaults to the model's ``max_seq_length`` so ONNX
+    truncation matches the SentenceTransformer reference.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    logger.info("Exporting %s to ONNX in %s", model_name, out)
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    max_length = max_length or st_model.max_seq_length
+    transformer = st_model[0]
+    auto_model = transformer.auto_model.eval()
+    pooling_module = st_model[1]
+    pooling = getattr(pooling_module, "pooling_mode", None) or pooling_module.get_pooling_mode_str()
+    if pooling not in SUPPORTED_POOLING:
+        raise ValueError(
+            f"Pooling mode '{pooling}' of {model_name} not supported; "
+            f"expected one of {', '.join(SUPPORTED_POOLING)}."
+        )
+    transformer.tokenizer.save_pretrained(out)
+
+    dummy = transformer.tokenizer(["SONiC configuration"], return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in dummy]
+
+    class _HiddenState(torch.nn.Module):
+        # Keyword call keeps the export independent of forward() arg order
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs)), return_dict=True).last_hidden_state
+    dynamic_axes = {n: {0: "batch", 1: "sequence"} for n in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    # Newer torch defaults to the dynamo exporter; keep the TorchScript one,
+    # which handles dynamic_axes without extra dependencies.
+    export_kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False
+
+    fp32_path = out / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            _HiddenState(auto_model),
+            tuple(dummy[n] for n in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            **export_kwargs,
+        )
+
+    model_file = fp32_path.name
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = out / "model_int8.onnx"
+        quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+        model_file = int8_path.name
+
+    (out / METADATA_FILE).write_text(json.dumps({
+        "model_name": model_name,
+        "model_file": model_file,
+        "pooling": pooling,
+        "max_length": max_length,
+    }, indent=2))
+    logger.info("Exported %s (pooling: %s)", model_file, pooling)
+    return out
+
+
+def check_parity(model_dir: str = ONNX_MODEL_DIR, texts=None,
+                 threshold: float = ONNX_PARITY_THRESHOLD):
+    """
+    Compare ONNX embeddings against the PyTorch model. Requires torch.
+
+    Returns the lowest per-text cosine similarity and raises ``ValueError``
+    when it falls below ``threshold``.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    texts = texts or PARITY_SAMPLES
+    onnx_model = OnnxEmbedder(model_dir)
+    reference = SentenceTransformer(onnx_model.model_name, device="cpu").encode(
+        texts, normalize_embeddings=True
+    )
+    candidate = onnx_model.encode(texts, normalize_embeddings=True)
+
+    min_cosine = float((reference * candidate).sum(axis=1).min())
+    logger.info("ONNX parity for %s: min cosine %.5f", onnx_model.model_file, min_cosine)
+    if min_cosine < threshold:
+        raise ValueError(
+            f"ONNX embeddings diverge from PyTorch: min cosine {min_cosine:.5f} < {threshold}"
+        )
+    return min_cosine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX.")
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    parser.add_argument("--out-dir", default=ONNX_MODEL_DIR)
+    parser.add_argument("--no-quantize", action="store_true", help="keep fp32 weights")
+    parser.add_argument("--threshold", type=float, default=ONNX_PARITY_THRESHOLD)
+    args = parser.parse_args()
+
+    out = export_onnx(args.model, args.out_dir, quantize=not args.no_quantize)
+    min_cosine = check_parity(out, threshold=args.threshold)
+    print(f"✅ Exported to {out} (min cosine vs PyTorch: {min_cosine:.5f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Layout-aware PDF extraction.
+
+This module reads pages through PyMuPDF's ``get_text("dict")`` output
+instead of plain text, which gives:
+- Per-block font sizes, used to tell headings from body text
+- Block positions, used to drop running headers/footers by page margin
+- The PDF outline (bookmarks), used as authoritative section boundaries
+
+Page extraction only depends on ``fitz`` so it can run in worker processes
+without loading the tokenizer; section assembly happens in ``chunking``.
+"""
+
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import fitz
+
+# Fraction of the page height treated as header / footer area
+HEADER_MARGIN = 0.06
+FOOTER_MARGIN = 0.06
+
+# A block is a heading when its font is this much larger than body text
+HEADING_SIZE_RATIO = 1.15
+MAX_HEADING_CHARS = 150
+
+# Spawning a worker costs ~0.5-1s while in-process extraction of a simple
+# page is ~1ms (200 pages: 0.07s in-process vs 0.95s with 3 workers), so
+# parallel extraction is opt-in and each worker needs a large page share
+MIN_PAGES_PER_WORKER = 200
+
+_whitespace = re.compile(r"\s+")
+# Leading section number, e.g. "2.1 " or "3. ", which outline titles often omit
+_section_number = re.compile(r"^\d+(\.\d+)*\.?\s+")
+
+
+def normalize_title(text):
+    text = _whitespace.sub(" ", text).strip().casefold()
+    return _section_number.sub("", text)
+
+
+def outline_titles(doc, start_page, end_page, max_level=2):
+    """
+    Map page index -> outline titles starting on that page.
+
+    Only entries up to ``max_level`` (chapters and sections) are used.
+    """
+    titles = {}
+    for level, title, page in doc.get_toc(simple=True):
+        page_index = page - 1
+        if level <= max_level and start_page <= page_index <= end_page and title.strip():
+            titles.setdefault(page_index, []).append(title.strip())
+    return titles
+
+
+def _page_blocks(page):
+    """
+    Return ``[(lines, font_size, chars)]`` for the text blocks of a page,
+    skipping blocks that sit entirely in the header or footer margin.
+    """
+    height = page.rect.height
+    top = height * HEADER_MARGIN
+    bottom = height * (1 - FOOTER_MARGIN)
+
+    blocks = []
+    for block in page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)["blocks"]:
+        x0, y0, x1, y1 = block["bbox"]
+        if y1 <= top or y0 >= bottom:
+            continue
+
+        lines = []
+        size = 0.0
+        chars = 0
+        for line in block.get("lines", []):
+            text = "".join(span["text"] for span in line["spans"])
+            if not text.strip():
+                continue
+            lines.append(text)
+            for span in line["spans"]:
+                size = max(size, span["size"])
+                chars += len(span["text"])
+        if lines:
+            blocks.append((lines, round(size, 1), chars))
+    return blocks
+
+
+def _extract_pages(pdf_path, first, last):
+    with fitz.open(pdf_path) as doc:
+        return [(i, _page_blocks(doc[i])) for i in range(first, last + 1)]
+
+
+def extract_layout(pdf_path, start_page, end_page, workers=None):
+    """
+    Extract text blocks for a page range.
+
+    Extraction runs in-process unless ``workers`` > 1 is passed explicitly,
+    and even then only when each worker gets ``MIN_PAGES_PER_WORKER`` pages.
+
+    Returns ``(pages, outline, body_size)`` where ``pages`` is an ordered
+    list of ``(page_index, blocks)``, ``outline`` comes from
+    :func:`outline_titles` and ``body_size`` is the dominant font size.
+    """
+    with fitz.open(pdf_path) as doc:
+        end_page = min(end_page if end_page is not None else len(doc) - 1, len(doc) - 1)
+        outline = outline_titles(doc, start_page, end_page)
+
+    page_count = end_page - start_page + 1
+    workers = max(1, min(workers or 1, page_count // MIN_PAGES_PER_WORKER))
+
+    if workers == 1:
+        pages = _extract_pages(pdf_path, start_page, end_page)
+    else:
+        step = -(-page_count // workers)
+        ranges = [
+            (first, min(first + step - 1, end_page))
+            for first in range(start_page, end_page + 1, step)
+        ]
+        # fitz documents are not shareable across threads; each process
+        # opens its own handle. "spawn" avoids forking a process that
+        # already runs the logging thread.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            futures = [pool.submit(_extract_pages, pdf_path, first, last) for first, last in ranges]
+            pages = [page for future in futures for page in future.result()]
+
+    sizes = Counter()
+    for _, blocks in pages:
+        for _, size, chars in blocks:
+            sizes[size] += chars
+    body_size = sizes.most_common(1)[0][0] if sizes else 0.0
+
+    return pages, outline, body_size
+
+
+def is_heading_block(lines, size, body_size):
+    return (
+        body_size > 0
+        and size >= body_size * HEADING_SIZE_RATIO
+        and len(" ".join(lines)) <= MAX_HEADING_CHARS
+    )
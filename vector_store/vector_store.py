@@ -29,12 +29,15 @@ PG_CONFIG = {
 }
 
 
-def insert_chunks_to_pg(chunks, embed_fn, vb_table_name):
+def insert_chunks_to_pg(chunks, embed_fn, vb_table_name, embeddings=None):
     """
     Insert document chunks into PGVector table.
+
+    Precomputed ``embeddings`` (one row per chunk) are used when given,
+    otherwise each chunk is embedded with ``embed_fn``.
     """
     try:
-        logger.info(f"Inserting {len(chunks)} chunks into table: {vb_table_name}")
+        logger.info("Inserting %s chunks into table: %s", len(chunks), vb_table_name)
         conn = psycopg2.connect(**PG_CONFIG)
         cur = conn.cursor()
 
@@ -51,8 +54,8 @@ def insert_chunks_to_pg(chunks, embed_fn, vb_table_name):
         );
         """)
 
-        for chunk in chunks:
-            emb = embed_fn(chunk['content'])
+        for i, chunk in enumerate(chunks):
+            emb = embed_fn(chunk['content']) if embeddings is None else [float(v) for v in embeddings[i]]
             cur.execute(
                 f"""INSERT INTO {vb_table_name} (section, content, embedding, page_range, source)
                     VALUES (%s, %s, %s, %s, %s);""",
@@ -62,9 +65,9 @@ def insert_chunks_to_pg(chunks, embed_fn, vb_table_name):
         conn.commit()
         cur.close()
         conn.close()
-        logger.info(f"Successfully inserted chunks into table: {vb_table_name}")
+        logger.info("Successfully inserted chunks into table: %s", vb_table_name)
     except Exception as e:
-        logger.error(f"Error inserting chunks into PGVector: {str(e)}")
+        logger.error("Error inserting chunks into PGVector: %s", e)
         raise
 
 
@@ -73,15 +76,15 @@ def clear_pgvector_table(vb_table_name):
     Clear all embeddings from a PGVector table.
     """
     try:
-        logger.info(f"Clearing table: {vb_table_name}")
+        logger.info("Clearing table: %s", vb_table_name)
         conn = psycopg2.connect(**PG_CONFIG)
         cur = conn.cursor()
         cur.execute(f"DELETE FROM {vb_table_name};")
         conn.commit()
         cur.close()
         conn.close()
-        logger.info(f"Successfully cleared table: {vb_table_name}")
+        logger.info("Successfully cleared table: %s", vb_table_name)
         print(f"✅ Table '{vb_table_name}' cleared successfully.")
     except Exception as e:
-        logger.error(f"Error clearing PGVector table: {str(e)}")
+        logger.error("Error clearing PGVector table: %s", e)
         raise
\ No newline at end of file